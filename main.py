@@ -4,23 +4,32 @@
                         Rubik's Cube Solver Program
 =========================================================================
 
-A Python program to solve a 3x3x3 Rubik's Cubes. Draws the cube using MATPLOTLIB. Uses the
-Layer-by-Layer approach to solve the cube.
+A Python program to solve a 3x3x3 Rubik's Cubes. Draws the cube using OpenGL (ModernGL), or
+MATPLOTLIB when ModernGL is not available. Uses the Layer-by-Layer approach to solve the cube.
 
 Dependencies:
 - Python 3.7
 - matplotlib
 - numpy
+- numba (optional)
+- cython (optional)
+- moderngl, glfw (optional)
 
 Directories and Files:
 - maths
     * matrices.py : file that defines a Matrix class and its functions
+    * quaternion.py : file that defines a Quaternion class and the rotation quaternions
     * points.py : file that defines a Point class and its functions
 - rubiks
     * cube.py : file that defines the Cube class
+    * bitcube.py : file that defines the BitCube class (compact encoding for solvers)
+    * packed.py : file that defines the packed uint64 encoding of the pieces
     * piece.py : file that defines the Piece class and its functions
+    * piece_c.pyx : file that defines the compiled Piece class (used when built)
     * solver.py : file that defines the Solver class and its functions
     * draw.py : file that defines the Drawing class and functions
+    * draw_moderngl.py : file that defines the OpenGL Drawing class
+    * _kernels.py : file that defines the compiled kernels for the cube moves
 - main.py (this file) : defines the entry function for the program
 
 """
@@ -28,8 +37,13 @@ Directories and Files:
 # TODO: Implement solver in the main program
 
 # Import necessary internal modules
-from rubiks.draw import Drawing
-from rubiks.cube import Cube, VALID_NOTATION
+from rubiks.cube import Cube
+
+# Draw with OpenGL when moderngl and glfw are installed, otherwise fall back to matplotlib
+try:
+    from rubiks.draw_moderngl import Drawing
+except ImportError:
+    from rubiks.draw import Drawing
 
 def main():
     """
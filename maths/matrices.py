@@ -7,6 +7,8 @@ Defines the Matrix3D class
 
 """
 
+import numpy as np
+
 from maths.points import Point3D
 from numbers import Number
 
@@ -16,28 +18,41 @@ class Matrix3D:
     A class for working with 3x3x3 matrices
     """
 
+    __slots__ = ('data', '_rows')
+
     def __init__(self, *args):
         """
         :param args: Args for entering the data into the matrix
                      must be numeric and must have 9 elements
         """
 
-        if len(args) == 9:
-            # Args entered: 1, 2, 3, 4, 5, 6, 7, 8, 9
-            self.data = list(args)
-        elif len(args) == 3:
-            # Args entered: [[1, 2, 3], [4, 5, 6], [7, 8, 9]]
-            self.data = [elem for sub in args for elem in sub]
-        else:
-            # Args entered: [1, 2, 3, 4, 5, 6, 7, 8, 9]
-            self.__init__(*args[0])
+        # Args entered: 1, 2, 3, 4, 5, 6, 7, 8, 9 or [[1, 2, 3], [4, 5, 6], [7, 8, 9]]
+        data = args
 
-        if len(self.data) != 9:
+        if len(args) == 1:
+            # Args entered: [1, 2, 3, 4, 5, 6, 7, 8, 9], a 3x3 array, or any other iterable
+            data = args[0]
+            if not isinstance(data, (np.ndarray, tuple, list)):
+                data = list(data)
+
+        # Copied, so the caller's array is not frozen along with the matrix
+        data = np.array(data, dtype=np.float64)
+
+        if data.size != 9:
             raise ValueError(f"Matrix3D must have 9 elements, received {args}")
 
-        if any(elem is None for elem in self.data):
+        # None elements come through the conversion as NaN
+        if np.isnan(data).any():
             raise ValueError(f"Matrix3D does not accept None type")
 
+        self.data = data.reshape(3, 3)
+
+        # Read only, so the data can never drift from the cached rows below
+        self.data.flags.writeable = False
+
+        # Plain Python rows, so a point can be rotated without going through NumPy
+        self._rows = tuple(tuple(row) for row in self.data.tolist())
+
     def rows(self):
         """
         Get the rows in the matrix
@@ -45,9 +60,7 @@ class Matrix3D:
         :return: The rows in the matrix
         """
 
-        yield self.data[0:3]
-        yield self.data[3:6]
-        yield self.data[6:9]
+        return self.data
 
     def cols(self):
         """
@@ -56,9 +69,7 @@ class Matrix3D:
         :return: The columns in the matrix
         """
 
-        yield self.data[0:9:3]
-        yield self.data[1:9:3]
-        yield self.data[2:9:3]
+        return self.data.T
 
     def det(self):
         """
@@ -67,11 +78,7 @@ class Matrix3D:
         :return: The determinant
         """
 
-        a = self.data[0]*(self.data[4]*self.data[8] - self.data[5]*self.data[7])
-        b = self.data[1]*(self.data[3]*self.data[8] - self.data[5]*self.data[6])
-        c = self.data[2]*(self.data[3]*self.data[7] - self.data[4]*self.data[6])
-
-        return a - b + c
+        return np.linalg.det(self.data)
 
     def diag(self):
         """
@@ -80,7 +87,7 @@ class Matrix3D:
         :return: The main diagonal
         """
 
-        return self.data[0], self.data[4], self.data[8]
+        return self.data.diagonal()
 
     def __add__(self, other):
         """
@@ -92,7 +99,7 @@ class Matrix3D:
 
         assert type(other) == Matrix3D
 
-        return Matrix3D(a + b for a, b in zip(self.vals, other.vals))
+        return Matrix3D(self.data + other.data)
 
     def __sub__(self, other):
         """
@@ -104,7 +111,7 @@ class Matrix3D:
 
         assert type(other) == Matrix3D
 
-        return Matrix3D(a - b for a, b in zip(self.vals, other.vals))
+        return Matrix3D(self.data - other.data)
 
     def __mul__(self, other):
         """
@@ -115,12 +122,14 @@ class Matrix3D:
         """
 
         if isinstance(other, Point3D):
-            return Point3D([other.dot(Point3D(row)) for row in self.rows()])
+            x, y, z = other.x, other.y, other.z
+            (a, b, c), (d, e, f), (g, h, i) = self._rows
+
+            return Point3D._fast(a*x + b*y + c*z, d*x + e*y + f*z, g*x + h*y + i*z)
         elif isinstance(other, Matrix3D):
-            return Matrix3D(Point3D(row).dot(Point3D(col)) for row in self.rows() \
-                            for col in other.cols())
+            return Matrix3D(self.data @ other.data)
         elif isinstance(other, Number):
-            return Matrix3D(a*other for a in self.data)
+            return Matrix3D(self.data * other)
         else:
             raise ValueError(f"Matrix3D can only multiply the following types: "\
                              "Point3D, Matrix3D, Number")
@@ -128,7 +137,7 @@ class Matrix3D:
     def __str__(self):
         return "[{}, {}, {}\n"\
                 "{}, {}, {}\n"\
-                "{}, {}, {}]".format(*self.data)
+                "{}, {}, {}]".format(*self.data.ravel())
 
     def __repr__(self):
         return "Matrix3D" + str(self)
@@ -143,26 +152,51 @@ IDENTITY_MATRIX = Matrix3D((1, 0, 0),
 90 Degree Rotation Matrices
 
 CW is Clockwise and CC is Counter Clockwise
+
+These are stored as int8 arrays so the cube can rotate all of its
+piece positions in a single (exact) integer matmul
 """
 
-ROT_X_CW = Matrix3D((1, 0, 0),
-                    (0, 0, 1),
-                    (0, -1, 0))
-ROT_X_CC = Matrix3D((1, 0, 0),
-                    (0, 0, -1),
-                    (0, 1, 0))
-
-ROT_Y_CW = Matrix3D((0, 0, -1),
-                    (0, 1, 0),
-                    (1, 0, 0))
-ROT_Y_CC = Matrix3D((0, 0, 1),
-                    (0, 1, 0),
-                    (-1, 0, 0))
-
-ROT_Z_CW = Matrix3D((0, 1, 0),
-                    (-1, 0, 0),
-                    (0, 0, 1))
-ROT_Z_CC = Matrix3D((0, -1, 0),
-                    (1, 0, 0),
-                    (0, 0, 1))
+ROT_X_CW = np.array(((1, 0, 0),
+                     (0, 0, 1),
+                     (0, -1, 0)), dtype=np.int8)
+ROT_X_CC = np.array(((1, 0, 0),
+                     (0, 0, -1),
+                     (0, 1, 0)), dtype=np.int8)
+
+ROT_Y_CW = np.array(((0, 0, -1),
+                     (0, 1, 0),
+                     (1, 0, 0)), dtype=np.int8)
+ROT_Y_CC = np.array(((0, 0, 1),
+                     (0, 1, 0),
+                     (-1, 0, 0)), dtype=np.int8)
+
+ROT_Z_CW = np.array(((0, 1, 0),
+                     (-1, 0, 0),
+                     (0, 0, 1)), dtype=np.int8)
+ROT_Z_CC = np.array(((0, -1, 0),
+                     (1, 0, 0),
+                     (0, 0, 1)), dtype=np.int8)
+
+"""
+Transposed 90 Degree Rotation Matrices
+
+For rotating (N, 3) arrays of row vectors in one matmul: points @ ROT_T
+"""
+
+ROT_X_CW_T = ROT_X_CW.T.copy()
+ROT_X_CC_T = ROT_X_CC.T.copy()
+
+ROT_Y_CW_T = ROT_Y_CW.T.copy()
+ROT_Y_CC_T = ROT_Y_CC.T.copy()
+
+ROT_Z_CW_T = ROT_Z_CW.T.copy()
+ROT_Z_CC_T = ROT_Z_CC.T.copy()
+
+"""
+Rotation Ids
+
+Every 90 degree rotation, indexed by its rotation id
+"""
 
+ROTATIONS = (ROT_X_CW, ROT_X_CC, ROT_Y_CW, ROT_Y_CC, ROT_Z_CW, ROT_Z_CC)
@@ -7,6 +7,8 @@ Defines the Point3D class
 
 """
 
+import numpy as np
+
 from numbers import Number
 
 
@@ -15,6 +17,8 @@ class Point3D:
     A class for working with 3D points
     """
 
+    __slots__ = ('x', 'y', 'z')
+
     def __init__(self, x, y=None, z=None):
         """
         :param x: Tuple of all the coords or just the x coord
@@ -36,6 +40,24 @@ class Point3D:
         if any(elem is None for elem in [self.x, self.y, self.z]):
             raise ValueError(f"Point does not accept None types")
 
+    @classmethod
+    def _fast(cls, x, y, z):
+        """
+        Create a point from trusted coordinates, skipping the checks in __init__
+
+        :param x: x coord of point
+        :param y: y coord of point
+        :param z: z coord of point
+        :return: The new point
+        """
+
+        point = object.__new__(cls)
+        point.x = x
+        point.y = y
+        point.z = z
+
+        return point
+
     def get_coords(self):
         """
         :return: The coordinates stored in the Point
@@ -43,6 +65,13 @@ class Point3D:
 
         return self.x, self.y, self.z
 
+    def as_array(self):
+        """
+        :return: The coordinates as a np.ndarray
+        """
+
+        return np.array((self.x, self.y, self.z))
+
     def dot(self, other):
         """
         Calcualte the dot product of the point and another point
@@ -51,7 +80,7 @@ class Point3D:
         :return: The dot product of the two points
         """
 
-        assert type(other) == Point3D
+        assert isinstance(other, Point3D)
 
         return self.x*other.x + self.y*other.y + self.z*other.z
 
@@ -63,13 +92,13 @@ class Point3D:
         :return: The cross product of the two points (a new point)
         """
 
-        assert type(other) == Point3D
+        assert isinstance(other, Point3D)
 
         c_x = self.y*other.z - self.z*other.y
         c_y = self.z*other.x - self.x*other.z
         c_z = self.x*other.y - self.y*other.x
 
-        return Point3D(c_x, c_y, c_z)
+        return Point3D._fast(c_x, c_y, c_z)
 
     def __add__(self, other):
         """
@@ -79,10 +108,10 @@ class Point3D:
         :return: The addition of the point and another point
         """
 
+        # Point3D + Point3D is the common case, so check it first
+        # Only real points though, since other objects with x, y and z (like a Quaternion) are not
         if isinstance(other, Point3D):
-            c_x = self.x + other.x
-            c_y = self.y + other.y
-            c_z = self.z + other.z
+            return Point3D._fast(self.x + other.x, self.y + other.y, self.z + other.z)
         elif isinstance(other, (tuple, list)):
             assert len(other) == 3
 
@@ -93,7 +122,7 @@ class Point3D:
             raise ValueError(f"Point3D can only add the following types: " \
                                  "Point3D, tuple, list")
 
-        return Point3D(c_x, c_y, c_z)
+        return Point3D._fast(c_x, c_y, c_z)
 
     def __sub__(self, other):
         """
@@ -103,10 +132,10 @@ class Point3D:
         :return: The subtraction of the point and another point
         """
 
+        # Point3D - Point3D is the common case, so check it first
+        # Only real points though, since other objects with x, y and z (like a Quaternion) are not
         if isinstance(other, Point3D):
-            c_x = self.x - other.x
-            c_y = self.y - other.y
-            c_z = self.z - other.z
+            return Point3D._fast(self.x - other.x, self.y - other.y, self.z - other.z)
         elif isinstance(other, (tuple, list)):
             assert len(other) == 3
 
@@ -117,7 +146,7 @@ class Point3D:
             raise ValueError(f"Point3D can only subtract the following types: "\
                              "Point3D, tuple, list")
 
-        return Point3D(c_x, c_y, c_z)
+        return Point3D._fast(c_x, c_y, c_z)
 
     def __mul__(self, other):
         """
@@ -127,10 +156,10 @@ class Point3D:
         :return: The product of the two points
         """
 
+        # Point3D * Point3D is the common case, so check it first
+        # Only real points though, since other objects with x, y and z (like a Quaternion) are not
         if isinstance(other, Point3D):
-            c_x = self.x*other.x
-            c_y = self.y*other.y
-            c_z = self.z*other.z
+            return Point3D._fast(self.x*other.x, self.y*other.y, self.z*other.z)
         elif isinstance(other, (tuple, list)):
             assert len(other) == 3
 
@@ -145,7 +174,7 @@ class Point3D:
             raise ValueError(f"Point3D can only be multiplied by the following types: "\
                              "Point3D, tuple, list, or Number")
 
-        return Point3D(c_x, c_y, c_z)
+        return Point3D._fast(c_x, c_y, c_z)
 
     def __eq__(self, other):
         """
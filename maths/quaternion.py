@@ -0,0 +1,89 @@
+"""
+===============================================================
+                        Quaternion class
+===============================================================
+
+Defines the Quaternion class and the 90 degree rotation quaternions
+
+"""
+
+from typing import NamedTuple
+
+
+class Quaternion(NamedTuple):
+    """
+    A rotation quaternion scaled by sqrt(2)
+
+    Every component of a 90 degree rotation about a principal axis is 0 or
+    +-1/sqrt(2), so the quaternion is stored as small ints. The scale
+    cancels out in rotate_vec, which keeps the rotations exact.
+    """
+
+    w: int
+    x: int
+    y: int
+    z: int
+
+    def axis(self):
+        """
+        Get the index of the axis of rotation
+
+        :return: The index of the nonzero vector component
+        """
+
+        return (self.x != 0, self.y != 0, self.z != 0).index(True)
+
+
+def _cross(a, b):
+    """
+    Cross product of two 3D vectors
+
+    :param a: The first vector
+    :param b: The second vector
+    :return: The cross product (tuple)
+    """
+
+    return (a[1]*b[2] - a[2]*b[1],
+            a[2]*b[0] - a[0]*b[2],
+            a[0]*b[1] - a[1]*b[0])
+
+
+def rotate_vec(q, v):
+    """
+    Rotate a vector by a quaternion
+
+    Uses v' = v + 2w(q x v) + 2q x (q x v), where the factors of 2 cancel with
+    the sqrt(2) scale of the quaternion
+
+    :param q: The (scaled) rotation quaternion
+    :param v: The vector to rotate (x, y, z)
+    :return: The rotated vector (tuple)
+    """
+
+    q_v = (q.x, q.y, q.z)
+
+    t = _cross(q_v, v)
+    u = _cross(q_v, t)
+
+    return (v[0] + q.w*t[0] + u[0],
+            v[1] + q.w*t[1] + u[1],
+            v[2] + q.w*t[2] + u[2])
+
+
+"""
+90 Degree Rotation Quaternions
+
+CW is Clockwise and CC is Counter Clockwise, matching the rotation matrices
+"""
+
+QUAT_X_CW = Quaternion(1, -1, 0, 0)
+QUAT_X_CC = Quaternion(1, 1, 0, 0)
+
+QUAT_Y_CW = Quaternion(1, 0, -1, 0)
+QUAT_Y_CC = Quaternion(1, 0, 1, 0)
+
+QUAT_Z_CW = Quaternion(1, 0, 0, -1)
+QUAT_Z_CC = Quaternion(1, 0, 0, 1)
+
+# Every 90 degree rotation, indexed by its rotation id (same order as matrices.ROTATIONS)
+QUATERNIONS = (QUAT_X_CW, QUAT_X_CC, QUAT_Y_CW, QUAT_Y_CC, QUAT_Z_CW, QUAT_Z_CC)
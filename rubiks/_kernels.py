@@ -0,0 +1,175 @@
+"""
+============================================================
+                    Cube Kernels
+============================================================
+
+Defines the compiled kernels for the hot paths of the cube.
+
+Numba is optional: without it turn_face and apply_move are replaced by
+vectorized NumPy versions and the other kernels run as plain Python.
+
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """
+        Fallback for numba.njit that leaves the function as is
+
+        :return: The function, or a decorator returning the function
+        """
+
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, boundscheck=False)
+def turn_face(pos, colors, axis, perm, signs, i, j):
+    """
+    Turn the pieces on a face in place
+
+    Finding the pieces on the face, moving them and swapping their colors are
+    fused into a single pass over the pieces. A quarter turn is a signed axis
+    permutation, so the move is just loads, negations and stores (no matrix)
+
+    :param pos: The (N, 3) int8 piece positions
+    :param colors: The (N, 3) uint8 piece colors
+    :param axis: The (3,) int8 unit vector of the face
+    :param perm: The (3,) axis permutation of the turn (see piece.ROT_TABLE)
+    :param signs: The (3,) int8 signs of the turn (see piece.ROT_TABLE)
+    :param i: The first color axis to swap
+    :param j: The second color axis to swap
+    :return: None
+    """
+
+    for n in range(pos.shape[0]):
+        if pos[n, 0]*axis[0] + pos[n, 1]*axis[1] + pos[n, 2]*axis[2] > 0:
+            x, y, z = pos[n, perm[0]], pos[n, perm[1]], pos[n, perm[2]]
+
+            pos[n, 0] = signs[0]*x
+            pos[n, 1] = signs[1]*y
+            pos[n, 2] = signs[2]*z
+
+            colors[n, i], colors[n, j] = colors[n, j], colors[n, i]
+
+
+if not HAVE_NUMBA:
+    def turn_face(pos, colors, axis, perm, signs, i, j):
+        """
+        Turn the pieces on a face in place
+
+        Every piece is rotated and the results are selected with the face mask,
+        which avoids gathering and scattering the masked rows
+
+        :param pos: The (N, 3) int8 piece positions
+        :param colors: The (N, 3) uint8 piece colors
+        :param axis: The (3,) int8 unit vector of the face
+        :param perm: The (3,) axis permutation of the turn (see piece.ROT_TABLE)
+        :param signs: The (3,) int8 signs of the turn (see piece.ROT_TABLE)
+        :param i: The first color axis to swap
+        :param j: The second color axis to swap
+        :return: None
+        """
+
+        mask = (pos @ axis > 0)[:, None]
+
+        order = [0, 1, 2]
+        order[i], order[j] = j, i
+
+        np.copyto(pos, pos[:, perm] * signs, where=mask)
+        np.copyto(colors, colors[:, order], where=mask)
+
+
+@njit(cache=True, boundscheck=False)
+def apply_move(pos, colors, perm, signs, i, j, mask):
+    """
+    Rotate the masked pieces in place by a signed axis permutation
+
+    :param pos: The (N, 3) int8 piece positions
+    :param colors: The (N, 3) uint8 piece colors
+    :param perm: The axis permutation of the rotation (see piece.ROT_TABLE)
+    :param signs: The signs of the rotation (see piece.ROT_TABLE)
+    :param i: The first color axis to swap
+    :param j: The second color axis to swap
+    :param mask: The (N,) boolean mask of the pieces to rotate
+    :return: None
+    """
+
+    for n in range(pos.shape[0]):
+        if mask[n]:
+            x, y, z = pos[n, perm[0]], pos[n, perm[1]], pos[n, perm[2]]
+
+            pos[n, 0] = signs[0]*x
+            pos[n, 1] = signs[1]*y
+            pos[n, 2] = signs[2]*z
+
+            colors[n, i], colors[n, j] = colors[n, j], colors[n, i]
+
+
+if not HAVE_NUMBA:
+    def apply_move(pos, colors, perm, signs, i, j, mask):
+        """
+        Rotate the masked pieces in place by a signed axis permutation
+
+        :param pos: The (N, 3) int8 piece positions
+        :param colors: The (N, 3) uint8 piece colors
+        :param perm: The axis permutation of the rotation (see piece.ROT_TABLE)
+        :param signs: The signs of the rotation (see piece.ROT_TABLE)
+        :param i: The first color axis to swap
+        :param j: The second color axis to swap
+        :param mask: The (N,) boolean mask of the pieces to rotate
+        :return: None
+        """
+
+        order = [0, 1, 2]
+        order[i], order[j] = j, i
+
+        pos[mask] = pos[mask][:, perm] * np.array(signs, dtype=np.int8)
+        colors[mask] = colors[mask][:, order]
+
+
+@njit(cache=True, boundscheck=False)
+def turn_faces(pos, colors, move_ids, axes, perms, signs, swaps):
+    """
+    Apply a sequence of face turns in place
+
+    :param pos: The (N, 3) int8 piece positions
+    :param colors: The (N, 3) uint8 piece colors
+    :param move_ids: The (M,) ids of the moves to apply
+    :param axes: The (12, 3) int8 face unit vector of each move
+    :param perms: The (12, 3) axis permutation of each move
+    :param signs: The (12, 3) int8 signs of each move
+    :param swaps: The (12, 2) color axes to swap for each move
+    :return: None
+    """
+
+    for m in move_ids:
+        turn_face(pos, colors, axes[m], perms[m], signs[m], swaps[m, 0], swaps[m, 1])
+
+
+@njit(cache=True, boundscheck=False)
+def apply_sequence(state, move_ids, perms, deltas, mod):
+    """
+    Apply a sequence of moves to a permutation/orientation state
+
+    :param state: The (40,) uint8 state (20 pieces, then 20 orientations)
+    :param move_ids: The (M,) ids of the moves to apply
+    :param perms: The (12, 40) permutation of each move
+    :param deltas: The (12, 20) orientation change of each move
+    :param mod: The (20,) number of orientations of each slot
+    :return: The new state
+    """
+
+    for m in move_ids:
+        state = state[perms[m]]
+        for k in range(20):
+            state[20 + k] = (state[20 + k] + deltas[m, k]) % mod[k]
+
+    return state
@@ -0,0 +1,220 @@
+"""
+============================================================
+                    BitCube Class
+============================================================
+
+Defines the BitCube class, a compact encoding of the cube for solvers.
+
+The 20 movable pieces (8 corners, then 12 edges) are stored as a single
+(40,) uint8 array: the piece in every slot, followed by the orientation
+of the piece in every slot (mod 3 for corners, mod 2 for edges). Each
+move is then just a permutation of the array plus an orientation delta.
+
+"""
+
+# Import necessary modules
+import numpy as np
+
+from rubiks.cube import Cube, AXES, MOVES, MOVE_MATRIX, MOVE_ID, VALID_NOTATION_SET, CORNERS, EDGES
+from rubiks._kernels import apply_sequence
+from rubiks.piece import RubiksColors
+
+# Positions of the 20 slots, taken from the solved cube
+_SOLVED = Cube()
+_ROWS = np.r_[np.arange(CORNERS.start, CORNERS.stop), np.arange(EDGES.start, EDGES.stop)]
+_SLOTS = _SOLVED.positions[_ROWS]
+_SLOT_INDEX = {tuple(pos.tolist()): i for i, pos in enumerate(_SLOTS)}
+
+# Number of orientations of the piece in each slot
+MOD = np.array([3]*8 + [2]*12, dtype=np.uint8)
+
+SOLVED_STATE = np.concatenate((np.arange(20), np.zeros(20))).astype(np.uint8)
+
+
+def _axis_order(pos):
+    """
+    Find the order of the sticker axes of a slot
+
+    Orientations count steps along this order. For corners the order follows
+    the handedness of the slot, so a turn always twists a corner by the same amount
+
+    :param pos: The position of the slot
+    :return: Tuple of the axes of the stickers
+    """
+
+    axes = tuple(np.flatnonzero(pos).tolist())
+
+    if len(axes) == 3 and pos[0]*pos[1]*pos[2] < 0:
+        return 0, 2, 1
+    return axes
+
+
+def _build_tables():
+    """
+    Build the permutation and orientation tables of every move
+
+    :return: Tuple of the (12, 40) permutations and (12, 20) orientation deltas
+    """
+
+    perm = np.tile(np.arange(40, dtype=np.int8), (len(MOVE_ID), 1))
+    delta = np.zeros((len(MOVE_ID), 20), dtype=np.int8)
+
+    for sym, m in MOVE_ID.items():
+        axis_id, matrix = MOVES[sym]
+
+        # Rotate every slot on the face in one matmul
+        on_face = np.flatnonzero(_SLOTS @ AXES[axis_id] > 0)
+        new_slots = _SLOTS[on_face] @ MOVE_MATRIX[sym]
+
+        for s, new_pos in zip(on_face, new_slots):
+            t = _SLOT_INDEX[tuple(new_pos.tolist())]
+
+            # Follow the sticker at orientation 0 to its new axis
+            axis = _axis_order(_SLOTS[s])[0]
+            new_axis = np.flatnonzero(matrix[:, axis])[0]
+
+            # The pieces move from slot s to slot t
+            perm[m, t], perm[m, 20 + t] = s, 20 + s
+            delta[m, t] = _axis_order(new_pos).index(new_axis)
+
+    return perm, delta
+
+
+PERM, ORIENT_DELTA = _build_tables()
+
+
+class BitCube:
+    """
+    A class defining a 3x3x3 Rubik's Cube as a permutation/orientation array
+
+    The centers never move, so only the corners and edges are stored.
+    """
+
+    def __init__(self):
+        """
+        Start from the solved state
+        """
+
+        self.state = SOLVED_STATE.copy()
+
+    @classmethod
+    def from_cube(cls, cube):
+        """
+        Encode a Cube
+
+        :param cube: The cube to encode
+        :return: BitCube in the same state as the cube
+        """
+
+        assert type(cube) == Cube
+
+        bit_cube = cls()
+
+        for k, row in enumerate(_ROWS):
+            pos = cube.positions[row]
+            t = _SLOT_INDEX[tuple(pos.tolist())]
+
+            # Find where the sticker at orientation 0 in the solved cube is now
+            ref = _SOLVED.colors[row, _axis_order(_SLOTS[k])[0]]
+            axis = np.flatnonzero(cube.colors[row] == ref)[0]
+
+            bit_cube.state[t] = k
+            bit_cube.state[20 + t] = _axis_order(pos).index(axis)
+
+        return bit_cube
+
+    def decode(self):
+        """
+        Decode the state into the positions and colors arrays of a Cube
+
+        :return: Tuple of the (26, 3) positions and colors
+        """
+
+        positions = _SOLVED.positions.copy()
+        colors = _SOLVED.colors.copy()
+
+        for t in range(20):
+            k, orient = self.state[t], self.state[20 + t]
+            row = _ROWS[k]
+
+            home, order = _axis_order(_SLOTS[k]), _axis_order(_SLOTS[t])
+
+            positions[row] = _SLOTS[t]
+            colors[row] = RubiksColors.BLANK
+            for i, axis in enumerate(home):
+                colors[row, order[(i + orient) % len(order)]] = _SOLVED.colors[row, axis]
+
+        return positions, colors
+
+    def move(self, sym):
+        """
+        Apply a single move given in Rubik's notation
+
+        :param sym: The move symbol
+        :return: None
+        """
+
+        m = MOVE_ID[sym]
+
+        self.state = self.state[PERM[m]]
+        self.state[20:] = (self.state[20:] + ORIENT_DELTA[m]) % MOD
+
+    def sequence(self, move_str):
+        """
+        Sequence through a list of rotations given in Rubik's notation
+
+        :param move_str: The sequence to move by
+        :return: None
+        """
+
+        assert type(move_str) == str
+
+        syms = move_str.split()
+        assert all(s in VALID_NOTATION_SET for s in syms)
+
+        move_ids = np.fromiter((MOVE_ID[s] for s in syms), dtype=np.int8, count=len(syms))
+
+        self.state = apply_sequence(self.state, move_ids, PERM, ORIENT_DELTA, MOD)
+
+    def is_solved(self):
+        """
+        Check if the cube is solved
+
+        :return: Bool indicating if cube is solved
+        """
+
+        return np.array_equal(self.state, SOLVED_STATE)
+
+    def __eq__(self, other):
+        """
+        Equal to operator
+
+        :param other: Compare object
+        :return: Bool for if the objects are equal
+        """
+
+        if not isinstance(other, BitCube):
+            return NotImplemented
+
+        return np.array_equal(self.state, other.state)
+
+    def __ne__(self, other):
+        return not self == other
+
+    # Not hashable, since moves change what the cube compares equal to (use key instead)
+    __hash__ = None
+
+    def key(self):
+        """
+        Get an immutable snapshot of the cube, for use as a dict or set key
+
+        :return: The bytes of the state
+        """
+
+        return self.state.tobytes()
+
+    def __str__(self):
+        return "Perm: {}, Orient: {}".format(self.state[:20].tolist(), self.state[20:].tolist())
+
+    def __repr__(self):
+        return "BitCube(" + str(self) + ")"
@@ -8,30 +8,187 @@ Defines the Cube class and helper data.
 """
 
 # Import necessary modules
-from rubiks.piece import Piece, RubiksColors as Colors
-from maths.points import Point3D
-from maths.matrices import Matrix3D, ROT_X_CC, ROT_X_CW, ROT_Y_CC, ROT_Y_CW, ROT_Z_CC, ROT_Z_CW
+import numpy as np
 
-# Helper Points for representing the different pieces
-FRONT   = Point3D((1, 0, 0))
-BACK    = Point3D((-1, 0, 0))
-LEFT    = Point3D((0, -1, 0))
-RIGHT   = Point3D((0, 1, 0))
-UP      = Point3D((0, 0, 1))
-DOWN    = Point3D((0, 0, -1))
+from rubiks.piece import Piece, PieceTypes, RubiksColors as Colors, COLOR_NAMES
+from rubiks.piece import ROT_TABLE, _TYPE_BY_NONZERO
+from rubiks._kernels import turn_face, turn_faces, apply_move
+from maths.points import Point3D
+from maths.matrices import ROT_X_CC, ROT_X_CW, ROT_Y_CC, ROT_Y_CW, ROT_Z_CC, ROT_Z_CW
+from maths.matrices import ROT_X_CC_T, ROT_X_CW_T, ROT_Y_CC_T, ROT_Y_CW_T, ROT_Z_CC_T, ROT_Z_CW_T
+from maths.matrices import ROTATIONS
+
+# Helper unit vectors for representing the different pieces
+FRONT   = np.array((1, 0, 0), dtype=np.int8)
+BACK    = np.array((-1, 0, 0), dtype=np.int8)
+LEFT    = np.array((0, -1, 0), dtype=np.int8)
+RIGHT   = np.array((0, 1, 0), dtype=np.int8)
+UP      = np.array((0, 0, 1), dtype=np.int8)
+DOWN    = np.array((0, 0, -1), dtype=np.int8)
+
+# Lookup of the face unit vectors by name
+AXES = {
+    'FRONT': FRONT,
+    'BACK': BACK,
+    'LEFT': LEFT,
+    'RIGHT': RIGHT,
+    'UP': UP,
+    'DOWN': DOWN
+}
+
+# Index of the coordinate (and color channel) along each face's axis
+AXIS_INDEX = {
+    'FRONT': 0,
+    'BACK': 0,
+    'LEFT': 1,
+    'RIGHT': 1,
+    'UP': 2,
+    'DOWN': 2
+}
+
+# Color channels swapped by a quarter turn about each axis (indexed like AXIS_INDEX)
+SWAP_CHANNELS = ((1, 2), (0, 2), (0, 1))
+
+# Every color, indexed by value
+_COLORS = tuple(Colors)
 
 # Helper str for valid move symbols
 VALID_NOTATION = 'L Li R Ri F Fi B Bi U Ui D Di'
+VALID_NOTATION_SET = frozenset(VALID_NOTATION.split())
+
+# The face and rotation matrix of every move symbol
+MOVES = {
+    'L': ('LEFT', ROT_Y_CW),
+    'Li': ('LEFT', ROT_Y_CC),
+    'R': ('RIGHT', ROT_Y_CC),
+    'Ri': ('RIGHT', ROT_Y_CW),
+    'F': ('FRONT', ROT_X_CW),
+    'Fi': ('FRONT', ROT_X_CC),
+    'B': ('BACK', ROT_X_CC),
+    'Bi': ('BACK', ROT_X_CW),
+    'U': ('UP', ROT_Z_CW),
+    'Ui': ('UP', ROT_Z_CC),
+    'D': ('DOWN', ROT_Z_CC),
+    'Di': ('DOWN', ROT_Z_CW)
+}
+
+# The transposed rotation matrix of every move symbol, for rotating (N, 3) positions
+MOVE_MATRIX = {
+    'L': ROT_Y_CW_T,
+    'Li': ROT_Y_CC_T,
+    'R': ROT_Y_CC_T,
+    'Ri': ROT_Y_CW_T,
+    'F': ROT_X_CW_T,
+    'Fi': ROT_X_CC_T,
+    'B': ROT_X_CC_T,
+    'Bi': ROT_X_CW_T,
+    'U': ROT_Z_CW_T,
+    'Ui': ROT_Z_CC_T,
+    'D': ROT_Z_CC_T,
+    'Di': ROT_Z_CW_T
+}
+
+# Index of each move symbol in the move tables
+MOVE_ID = {sym: i for i, sym in enumerate(VALID_NOTATION.split())}
+
+# Rotation id of every move symbol (see ROT_TABLE)
+MOVE_ROT_ID = {sym: next(k for k, R in enumerate(ROTATIONS) if R is matrix)
+               for sym, (_, matrix) in MOVES.items()}
+
+# Face unit vector, signed axis permutation and the two color axes to swap for every move
+MOVE_AXES = np.array([AXES[MOVES[sym][0]] for sym in MOVE_ID], dtype=np.int8)
+MOVE_PERMS = np.array([ROT_TABLE[MOVE_ROT_ID[sym]][0] for sym in MOVE_ID], dtype=np.intp)
+MOVE_SIGNS = np.array([ROT_TABLE[MOVE_ROT_ID[sym]][1] for sym in MOVE_ID], dtype=np.int8)
+MOVE_SWAPS = np.array([SWAP_CHANNELS[AXIS_INDEX[MOVES[sym][0]]] for sym in MOVE_ID], dtype=np.intp)
+
+# Solved state of the cube as (position, colors) for every piece
+_SOLVED_PIECES = (
+    # Faces
+    (FRONT, (Colors.YELLOW, Colors.BLANK, Colors.BLANK)),
+    (BACK, (Colors.WHITE, Colors.BLANK, Colors.BLANK)),
+    (LEFT, (Colors.BLANK, Colors.BLUE, Colors.BLANK)),
+    (RIGHT, (Colors.BLANK, Colors.GREEN, Colors.BLANK)),
+    (UP, (Colors.BLANK, Colors.BLANK, Colors.ORANGE)),
+    (DOWN, (Colors.BLANK, Colors.BLANK, Colors.RED)),
+
+    # Edges
+    (FRONT+LEFT, (Colors.YELLOW, Colors.BLUE, Colors.BLANK)),
+    (FRONT+RIGHT, (Colors.YELLOW, Colors.GREEN, Colors.BLANK)),
+    (FRONT+UP, (Colors.YELLOW, Colors.BLANK, Colors.ORANGE)),
+    (FRONT+DOWN, (Colors.YELLOW, Colors.BLANK, Colors.RED)),
+    (BACK+LEFT, (Colors.WHITE, Colors.BLUE, Colors.BLANK)),
+    (BACK+RIGHT, (Colors.WHITE, Colors.GREEN, Colors.BLANK)),
+    (BACK+UP, (Colors.WHITE, Colors.BLANK, Colors.ORANGE)),
+    (BACK+DOWN, (Colors.WHITE, Colors.BLANK, Colors.RED)),
+    (LEFT+UP, (Colors.BLANK, Colors.BLUE, Colors.ORANGE)),
+    (LEFT+DOWN, (Colors.BLANK, Colors.BLUE, Colors.RED)),
+    (RIGHT+UP, (Colors.BLANK, Colors.GREEN, Colors.ORANGE)),
+    (RIGHT+DOWN, (Colors.BLANK, Colors.GREEN, Colors.RED)),
+
+    # Corners
+    (FRONT+LEFT+UP, (Colors.YELLOW, Colors.BLUE, Colors.ORANGE)),
+    (FRONT+LEFT+DOWN, (Colors.YELLOW, Colors.BLUE, Colors.RED)),
+    (FRONT+RIGHT+UP, (Colors.YELLOW, Colors.GREEN, Colors.ORANGE)),
+    (FRONT+RIGHT+DOWN, (Colors.YELLOW, Colors.GREEN, Colors.RED)),
+    (BACK+LEFT+UP, (Colors.WHITE, Colors.BLUE, Colors.ORANGE)),
+    (BACK+LEFT+DOWN, (Colors.WHITE, Colors.BLUE, Colors.RED)),
+    (BACK+RIGHT+UP, (Colors.WHITE, Colors.GREEN, Colors.ORANGE)),
+    (BACK+RIGHT+DOWN, (Colors.WHITE, Colors.GREEN, Colors.RED))
+)
+
+# Slices of the piece arrays holding each piece type
+FACES = slice(0, 6)
+EDGES = slice(6, 18)
+CORNERS = slice(18, 26)
+
+# Piece type by the number of nonzero coordinates, for finding the types of all pieces at once
+TYPE_BY_NONZERO = np.array((-1, PieceTypes.CENTER, PieceTypes.EDGE, PieceTypes.CORNER), dtype=np.int8)
+
+
+def _make_move(sym):
+    """
+    Build the function for a given move
+
+    Everything that only depends on the move is worked out here once,
+    so the move itself is a single kernel call
+
+    :param sym: The move symbol
+    :return: Function that applies the move to the cube it is given
+    """
+
+    m = MOVE_ID[sym]
+    axis_id = MOVES[sym][0]
+
+    axis, perm, signs = MOVE_AXES[m], MOVE_PERMS[m], MOVE_SIGNS[m]
+
+    # Swap the colors on the two axes perpendicular to the axis of rotation
+    i, j = SWAP_CHANNELS[AXIS_INDEX[axis_id]]
+
+    # A turn does not change which pieces are on the faces along its own axis,
+    # so only the masks of the other faces need to be recomputed
+    keep = tuple(k for k in AXES if AXIS_INDEX[k] == AXIS_INDEX[axis_id])
+
+    def move(cube):
+        turn_face(cube.positions, cube.colors, axis, perm, signs, i, j)
+        cube._face_masks = {k: cube._face_masks[k] for k in keep if k in cube._face_masks}
+
+    return move
+
+
+# Function for every move, keyed by the move symbol
+# These take the cube as an argument, so cubes can still be copied and pickled
+_MOVE_FNS = {sym: _make_move(sym) for sym in MOVES}
 
 
 class Cube:
     """
     A class defining a 3x3x3 Rubik's Cube
 
-    The cube is made out of a tuple of Piece types. Each Piece can be an EDGE, CORNER, or CENTER,
-    depending on how many colors the piece has. Each piece also has a position associated with it.
-    The positions are set up in a 3D coordinate system, where the center of the cube is the origin.
+    The cube is stored as two (26, 3) arrays, one row per piece. Each piece can be an EDGE, CORNER,
+    or CENTER, depending on how many colors the piece has. The positions array holds where each piece
+    is. The positions are set up in a 3D coordinate system, where the center of the cube is the origin.
     The axes go from -1 to 1, so a piece can have a -1, 0, or 1 for each coordinate [EX: (-1, 0, 1)].
+    The colors array holds the color (RubiksColors value) of each piece along the X, Y, and Z axes.
     the cube is printed in the following way:
 
           U U U
@@ -56,79 +213,66 @@ class Cube:
         Just need to set up the pieces
         """
 
-        self.faces = (
-            Piece(_pos=FRONT, _colors=[Colors.YELLOW, Colors.BLANK, Colors.BLANK]),
-            Piece(_pos=BACK, _colors=[Colors.WHITE, Colors.BLANK, Colors.BLANK]),
-            Piece(_pos=LEFT, _colors=[Colors.BLANK, Colors.BLUE, Colors.BLANK]),
-            Piece(_pos=RIGHT, _colors=[Colors.BLANK, Colors.GREEN, Colors.BLANK]),
-            Piece(_pos=UP, _colors=[Colors.BLANK, Colors.BLANK, Colors.ORANGE]),
-            Piece(_pos=DOWN, _colors=[Colors.BLANK, Colors.BLANK, Colors.RED])
-        )
+        self.positions = np.array([pos for pos, _ in _SOLVED_PIECES], dtype=np.int8)
+        self.colors = np.array([colors for _, colors in _SOLVED_PIECES], dtype=np.uint8)
 
-        self.edges = (
-            Piece(_pos=FRONT+LEFT, _colors=[Colors.YELLOW, Colors.BLUE, Colors.BLANK]),
-            Piece(_pos=FRONT+RIGHT, _colors=[Colors.YELLOW, Colors.GREEN, Colors.BLANK]),
-            Piece(_pos=FRONT+UP, _colors=[Colors.YELLOW, Colors.BLANK, Colors.ORANGE]),
-            Piece(_pos=FRONT+DOWN, _colors=[Colors.YELLOW, Colors.BLANK, Colors.RED]),
-            Piece(_pos=BACK+LEFT, _colors=[Colors.WHITE, Colors.BLUE, Colors.BLANK]),
-            Piece(_pos=BACK+RIGHT, _colors=[Colors.WHITE, Colors.GREEN, Colors.BLANK]),
-            Piece(_pos=BACK+UP, _colors=[Colors.WHITE, Colors.BLANK, Colors.ORANGE]),
-            Piece(_pos=BACK+DOWN, _colors=[Colors.WHITE, Colors.BLANK, Colors.RED]),
-            Piece(_pos=LEFT+UP, _colors=[Colors.BLANK, Colors.BLUE, Colors.ORANGE]),
-            Piece(_pos=LEFT+DOWN, _colors=[Colors.BLANK, Colors.BLUE, Colors.RED]),
-            Piece(_pos=RIGHT+UP, _colors=[Colors.BLANK, Colors.GREEN, Colors.ORANGE]),
-            Piece(_pos=RIGHT+DOWN, _colors=[Colors.BLANK, Colors.GREEN, Colors.RED])
-        )
+        # Cache of the face masks, keyed by the name of the face's axis
+        self._face_masks = {}
 
-        self.corners = (
-            Piece(_pos=FRONT+LEFT+UP, _colors=[Colors.YELLOW, Colors.BLUE, Colors.ORANGE]),
-            Piece(_pos=FRONT+LEFT+DOWN, _colors=[Colors.YELLOW, Colors.BLUE, Colors.RED]),
-            Piece(_pos=FRONT+RIGHT+UP, _colors=[Colors.YELLOW, Colors.GREEN, Colors.ORANGE]),
-            Piece(_pos=FRONT+RIGHT+DOWN, _colors=[Colors.YELLOW, Colors.GREEN, Colors.RED]),
-            Piece(_pos=BACK+LEFT+UP, _colors=[Colors.WHITE, Colors.BLUE, Colors.ORANGE]),
-            Piece(_pos=BACK+LEFT+DOWN, _colors=[Colors.WHITE, Colors.BLUE, Colors.RED]),
-            Piece(_pos=BACK+RIGHT+UP, _colors=[Colors.WHITE, Colors.GREEN, Colors.ORANGE]),
-            Piece(_pos=BACK+RIGHT+DOWN, _colors=[Colors.WHITE, Colors.GREEN, Colors.RED])
-        )
+    def _get_face(self, axis_id):
+        """
+        Find a face given the name of the axis (see AXES)
 
-        self.pieces = self.faces + self.edges + self.corners
+        Masks are cached until a move changes which pieces are on the face
 
-    def _get_face(self, axis):
+        :return: A boolean mask of the pieces on the face
         """
-        Find a face given a unit vector representing the axis
 
-        :return: A list of the pieces on the face
-        """
+        mask = self._face_masks.get(axis_id)
 
-        assert type(axis) == Point3D
-        assert len([elem for elem in axis if elem == 0]) == 2
+        if mask is None:
+            mask = self.positions @ AXES[axis_id] > 0
+            self._face_masks[axis_id] = mask
 
-        return [p for p in self.pieces if p.pos.dot(axis) > 0]
+        return mask
 
-    def _rotate_face(self, axis, matrix):
+    def rotate_layer(self, axis_id, layer, matrix):
         """
-        Rotate a given face by the given matrix
+        Rotate a whole layer of the cube, including the middle slices
 
-        :param axis: The axis to rotate about
-        :param matrix: The matrix to rotate by
+        :param axis_id: The name of the axis to rotate about (see AXES)
+        :param layer: Offset of the layer along the axis (1 is the face, 0 the middle slice)
+        :param matrix: The (3, 3) int8 rotation matrix (must rotate about the axis)
         :return: None
         """
 
-        assert type(matrix) is Matrix3D
+        k = AXIS_INDEX[axis_id]
+        assert matrix[k, k] == 1
+
+        # Gather the layer, rotate it in one matmul and scatter it back
+        mask = self.positions @ AXES[axis_id] == layer
+        self.positions[mask] = self.positions[mask] @ matrix.T
 
-        self._rotate_pieces(self._get_face(axis), matrix)
+        i, j = SWAP_CHANNELS[k]
+        self.colors[np.ix_(mask, (i, j))] = self.colors[np.ix_(mask, (j, i))]
 
-    def _rotate_pieces(self, face, matrix):
+        # Only the faces along the axis keep their pieces
+        self._face_masks = {f: m for f, m in self._face_masks.items() if AXIS_INDEX[f] == k}
+
+    def rotate(self, rot_id, mask):
         """
-        Rotate all the pieces in a face
+        Rotate any set of pieces by a 90 degree rotation
 
-        :param face: The face to rotate
-        :param matrix: The rotation matrix
+        :param rot_id: The id of the rotation to apply (see ROT_TABLE)
+        :param mask: Boolean mask of the pieces to rotate
         :return: None
         """
 
-        for p in face:
-            p.rotate(matrix)
+        perm, signs, (i, j) = ROT_TABLE[rot_id]
+        apply_move(self.positions, self.colors, perm, signs, i, j, mask)
+
+        # Any of the faces may have changed
+        self._face_masks = {}
 
     def is_solved(self):
         """
@@ -141,32 +285,37 @@ class Cube:
             """
             Internal helper function to check each face
 
-            :param colors: Colors to check (list)
+            :param colors: Colors to check (np.ndarray)
             :return: Bool if all the colors match
             """
             assert len(colors) == 9
-            return all(c == colors[0] for c in colors)
+            return bool(np.all(colors == colors[0]))
+
+        return all(check(self.colors[self._get_face(k), i]) for k, i in AXIS_INDEX.items())
+
+    def piece_types(self):
+        """
+        Find the type of every piece from its position
 
-        return (check(p.colors[0] for p in self._get_face(FRONT)) and
-                check(p.colors[0] for p in self._get_face(BACK)) and
-                check(p.colors[1] for p in self._get_face(LEFT)) and
-                check(p.colors[1] for p in self._get_face(RIGHT)) and
-                check(p.colors[2] for p in self._get_face(UP)) and
-                check(p.colors[2] for p in self._get_face(DOWN)))
+        :return: The (26,) int8 piece types (see PieceTypes)
+        """
+
+        return TYPE_BY_NONZERO[np.count_nonzero(self.positions, axis=1)]
 
     def find_piece(self, colors):
         """
         Find a piece given a color list
 
         :param colors: The list of colors to search for
-        :return: Piece that matches color list
+        :return: Piece that matches color list (a copy of the piece's current state)
         """
 
         assert isinstance(colors, (tuple, list)) and len(colors) == 3
 
-        for p in self.pieces:
-            if all(c in p.colors for c in colors):
-                return p
+        for pos, p_colors in zip(self.positions, self.colors):
+            if all(c in p_colors for c in colors):
+                return Piece._unchecked(Point3D._fast(*pos.tolist()), tuple(map(Colors, p_colors)),
+                                        _TYPE_BY_NONZERO[np.count_nonzero(pos)])
 
     def sequence(self, move_str):
         """
@@ -177,40 +326,49 @@ class Cube:
         """
 
         assert type(move_str) == str
-        assert all(s in VALID_NOTATION.split() for s in move_str.split())
 
-        # Find all the functions in this class that match the symbols in the move string
-        moves = [getattr(self, sym) for sym in move_str.split()]
+        # Checked only in debug builds, under -O an unknown symbol fails on the MOVE_ID lookup
+        syms = move_str.split()
+        assert all(s in VALID_NOTATION_SET for s in syms)
 
-        # Sequence the given moves
-        for move in moves:
-            move()
+        move_ids = np.fromiter((MOVE_ID[s] for s in syms), dtype=np.int8, count=len(syms))
 
-    def face_colors(self, axis):
+        # Sequence the given moves in a single kernel call
+        turn_faces(self.positions, self.colors, move_ids, MOVE_AXES, MOVE_PERMS, MOVE_SIGNS, MOVE_SWAPS)
+        self._face_masks = {}
+
+    def face_colors(self, axis_id):
         """
         Find all the colors on a face relating to the given axis
 
-        :param axis: The axis of the face
-        :return: A list of all the colors
+        :param axis_id: The name of the axis of the face (see AXES)
+        :return: A list of all the colors (RubiksColors)
         """
 
-        face = self._get_face(axis)
-        i = [j for j, x in enumerate(axis) if x == 1 or x == -1][0]
+        return [_COLORS[c] for c in self._face_values(axis_id)]
 
-        return [p.colors[i] for p in face]
+    def _face_values(self, axis_id):
+        """
+        Find the raw color values on a face relating to the given axis
 
-    def F(self): self._rotate_face(FRONT, ROT_X_CW)
-    def Fi(self): self._rotate_face(FRONT, ROT_X_CC)
-    def B(self): self._rotate_face(BACK, ROT_X_CC)
-    def Bi(self): self._rotate_face(BACK, ROT_X_CW)
-    def L(self): self._rotate_face(LEFT, ROT_Y_CW)
-    def Li(self): self._rotate_face(LEFT, ROT_Y_CC)
-    def R(self): self._rotate_face(RIGHT, ROT_Y_CC)
-    def Ri(self): self._rotate_face(RIGHT, ROT_Y_CW)
-    def U(self): self._rotate_face(UP, ROT_Z_CW)
-    def Ui(self): self._rotate_face(UP, ROT_Z_CC)
-    def D(self): self._rotate_face(DOWN, ROT_Z_CC)
-    def Di(self): self._rotate_face(DOWN, ROT_Z_CW)
+        :param axis_id: The name of the axis of the face (see AXES)
+        :return: A list of the color values (ints)
+        """
+
+        return self.colors[self._get_face(axis_id), AXIS_INDEX[axis_id]].tolist()
+
+    def F(self): _MOVE_FNS['F'](self)
+    def Fi(self): _MOVE_FNS['Fi'](self)
+    def B(self): _MOVE_FNS['B'](self)
+    def Bi(self): _MOVE_FNS['Bi'](self)
+    def L(self): _MOVE_FNS['L'](self)
+    def Li(self): _MOVE_FNS['Li'](self)
+    def R(self): _MOVE_FNS['R'](self)
+    def Ri(self): _MOVE_FNS['Ri'](self)
+    def U(self): _MOVE_FNS['U'](self)
+    def Ui(self): _MOVE_FNS['Ui'](self)
+    def D(self): _MOVE_FNS['D'](self)
+    def Di(self): _MOVE_FNS['Di'](self)
 
     def __eq__(self, other):
         """
@@ -222,7 +380,8 @@ class Cube:
 
         assert type(other) == Cube
 
-        return Cube.pieces == other.pieces
+        return (np.array_equal(self.positions, other.positions) and
+                np.array_equal(self.colors, other.colors))
 
     def __ne__(self, other):
         return not self == other
@@ -240,8 +399,12 @@ class Cube:
                     "         {} {} {}\n")
 
 
-        full_str = template.format(*(self.face_colors(UP) + self.face_colors(LEFT) + self.face_colors(FRONT) +
-                                     self.face_colors(RIGHT) + self.face_colors(BACK) + self.face_colors(DOWN)))
+        # Raw values index the names directly, with no RubiksColors made per sticker
+        colors = (self._face_values('UP') + self._face_values('LEFT') +
+                  self._face_values('FRONT') + self._face_values('RIGHT') +
+                  self._face_values('BACK') + self._face_values('DOWN'))
+
+        full_str = template.format(*(COLOR_NAMES[c] for c in colors))
 
         return full_str
 
@@ -15,11 +15,101 @@ Dependencies:
 import numpy as np
 import matplotlib.pyplot as plt
 
+from matplotlib.colors import to_rgba_array
+
 from mpl_toolkits.mplot3d import Axes3D # Registers 3D projection
 from mpl_toolkits.mplot3d.art3d import Poly3DCollection # For drawing the cuboids
 
 # Import internal necessary modules
 from rubiks.cube import Cube
+from rubiks.piece import RubiksColors, COLOR_NAMES
+
+# Unit cube for determining the shape of the cuboids
+_UNIT_CUBE = np.array([
+    [[0, 1, 0], [0, 0, 0], [1, 0, 0], [1, 1, 0]],  # Bottom Face
+    [[0, 0, 0], [0, 0, 1], [1, 0, 1], [1, 0, 0]],  # Left Face
+    [[1, 0, 1], [1, 0, 0], [1, 1, 0], [1, 1, 1]],  # Front Face
+    [[0, 0, 1], [0, 0, 0], [0, 1, 0], [0, 1, 1]],  # Back Face
+    [[0, 1, 0], [0, 1, 1], [1, 1, 1], [1, 1, 0]],  # Right Face
+    [[0, 1, 1], [0, 0, 1], [1, 0, 1], [1, 1, 1]]  # Top Face
+], dtype=np.float32)
+
+# RGBA value of each color, indexed by RubiksColors value
+PALETTE = to_rgba_array(COLOR_NAMES)
+BLACK_IDX = int(RubiksColors.BLANK)
+
+# Base 3 weights for turning a position into a slot code from 0 to 26
+_SLOT_WEIGHTS = np.array((9, 3, 1))
+
+# Color channel of the piece on each face of a cuboid, rearranged to match the drawing system
+# We only want to color the three outside faces of a cuboid (-1 is drawn black)
+_BASE_CHANNELS = np.array([2, 1, 0, -1, -1, -1], dtype=np.int8)
+
+
+def _swap_perm(sx, sy, sz):
+    """
+    Find the face permutation moving the colored faces of a cuboid to the outside
+
+    :param sx: Sign of the X coordinate of the cuboid
+    :param sy: Sign of the Y coordinate of the cuboid
+    :param sz: Sign of the Z coordinate of the cuboid
+    :return: The (6,) int8 permutation of the faces
+    """
+
+    perm = list(range(6))
+
+    if sx < 0:
+        perm[2], perm[3] = perm[3], perm[2]
+    if sy > 0:
+        perm[1], perm[4] = perm[4], perm[1]
+    if sz > 0:
+        perm[0], perm[5] = perm[5], perm[0]
+
+    return np.array(perm, dtype=np.int8)
+
+
+# Face permutation for every combination of coordinate signs, indexed by (sx+1, sy+1, sz+1)
+SWAP_LUT = np.array([[[_swap_perm(sx, sy, sz) for sz in (-1, 0, 1)]
+                      for sy in (-1, 0, 1)]
+                     for sx in (-1, 0, 1)])
+
+
+def slot_tables(positions):
+    """
+    Build the static lookup tables for drawing the cuboid slots
+
+    Every piece position is a distinct slot, whatever the state of the cube
+
+    :param positions: The (26, 3) piece positions of a cube
+    :return: Tuple of the (27,) slot code to slot lookup and the (26, 6) face color channels
+    """
+
+    slot_lut = np.full(27, -1, dtype=np.intp)
+    slot_lut[(positions + 1) @ _SLOT_WEIGHTS] = np.arange(len(positions))
+
+    # Color channel of the piece shown on each face of each slot
+    signs = np.sign(positions) + 1
+    face_slot = _BASE_CHANNELS[SWAP_LUT[signs[:, 0], signs[:, 1], signs[:, 2]]].astype(np.intp)
+
+    return slot_lut, face_slot
+
+
+def slot_colors(cube, slot_lut, face_slot):
+    """
+    Find the color of every face of every slot
+
+    :param cube: The cube to draw
+    :param slot_lut: The slot code to slot lookup (see slot_tables)
+    :param face_slot: The face color channels of every slot (see slot_tables)
+    :return: The (26, 6) RubiksColors value of every face
+    """
+
+    # Find the piece in every slot, inverting the piece to slot permutation with one scatter
+    n = len(cube.positions)
+    pieces = np.empty(n, dtype=np.intp)
+    pieces[slot_lut[(cube.positions + 1) @ _SLOT_WEIGHTS]] = np.arange(n)
+
+    return np.where(face_slot >= 0, cube.colors[pieces[:, None], face_slot], BLACK_IDX)
 
 
 class Drawing:
@@ -45,43 +135,80 @@ class Drawing:
         self.grid = _grid
         self.axes = _axes
         self.size = _sizes
+        self._size_arr = np.asarray(_sizes, dtype=np.float32)
 
         self.context = None
         self.CONTEXT_OPEN = False
 
+        # Static geometry of the cuboids, built in init_context
+        self._slot_lut = None
+        self._face_slot = None
+        self._vertices = None
+        self._poly = None
+
+        # Face colors currently on screen
+        self._drawn = None
+
     def init_context(self):
         """
         Create an initialize the window
 
+        The cuboid geometry never changes (only the colors shown in each slot do),
+        so the vertices are built once here and drawn as a single collection
+
         :return: None
         """
 
         self.__create_context__()
+
+        self._slot_lut, self._face_slot = slot_tables(self.cube.positions)
+        self._vertices = self.__cubify__(self.cube.positions)
+
+        # One collection for all the faces of all the cuboids
+        self._poly = self.__create_voxel__(self._vertices.reshape(-1, 4, 3))
+        self.context.add_collection3d(self._poly)
+
+        self.draw()
         self.CONTEXT_OPEN = True
 
     def draw(self):
         """
         Updates the graph with new data
 
-        :return: None
+        :return: Bool for if the colors changed since the last draw
         """
 
-        # Create the voxels
-        for p in self.cube.pieces:
-            pos = tuple(x for x in p.pos)
-            voxel = self.__create_voxel__(self.__create_cuboid__(pos, p.colors))
-            self.context.add_collection3d(voxel)
+        face_colors = slot_colors(self.cube, self._slot_lut, self._face_slot)
 
-    def update(self, _pause=0.001):
-        # Redraw the plot with new data if window is still open
-        self.draw()
-        if plt.get_fignums():
-            plt.draw()
-            plt.pause(_pause)
-            self.context.cla()
-            self.__set_context__()
-        else:
+        if self._drawn is not None and np.array_equal(face_colors, self._drawn):
+            return False
+        self._drawn = face_colors
+
+        # Recolor all the faces at once, in the same order as the vertices
+        self._poly.set_facecolor(PALETTE[face_colors.ravel()])
+        return True
+
+    def update(self, _pause=0):
+        """
+        Redraw the plot with new data if window is still open
+
+        Nothing is redrawn (or waited on) unless the cube changed
+
+        :param _pause: Seconds to keep running the window's event loop after a redraw
+        :return: None
+        """
+
+        if not plt.get_fignums():
             self.CONTEXT_OPEN = False
+            return
+
+        if self.draw():
+            canvas = self.context.figure.canvas
+            canvas.draw_idle()
+            canvas.flush_events()
+
+            if _pause > 0:
+                canvas.start_event_loop(_pause)
 
     def keep_open(self):
         """
@@ -92,6 +219,7 @@ class Drawing:
 
         if self.CONTEXT_OPEN and plt.get_fignums():
             self.draw()
+            plt.ioff()
             plt.show()
 
     def context_opened(self):
@@ -104,8 +232,10 @@ class Drawing:
         :return: Context of the plot
         """
 
+        # Interactive mode shows the window without blocking, so it can be redrawn from update
+        plt.ion()
         fig = plt.figure("Rubik's Cube")
-        self.context = fig.gca(projection='3d')
+        self.context = fig.add_subplot(projection='3d')
         self.__set_context__()
 
     def __set_context__(self):
@@ -130,76 +260,26 @@ class Drawing:
         """
         Create a list of vertices to draw cuboids
 
-        :param coords: Coordinates of cuboids
-        :return: List of vertices to draw the cuboid
+        :param coords: Coordinates of a cuboid (3,) or of several cuboids (N, 3)
+        :return: Array of vertices to draw the cuboids, (6, 4, 3) or (N, 6, 4, 3)
         """
 
         assert coords is not None
 
-        # Unit cube for determining the shape of the cuboid
-        unit_cube = [
-            [[0, 1, 0], [0, 0, 0], [1, 0, 0], [1, 1, 0]],  # Bottom Face
-            [[0, 0, 0], [0, 0, 1], [1, 0, 1], [1, 0, 0]],  # Left Face
-            [[1, 0, 1], [1, 0, 0], [1, 1, 0], [1, 1, 1]],  # Front Face
-            [[0, 0, 1], [0, 0, 0], [0, 1, 0], [0, 1, 1]],  # Back Face
-            [[0, 1, 0], [0, 1, 1], [1, 1, 1], [1, 1, 0]],  # Right Face
-            [[0, 1, 1], [0, 0, 1], [1, 0, 1], [1, 1, 1]]  # Top Face
-        ]
-        unit_cube = np.array(unit_cube).astype(float)
-
-        # Resize cube based on given size and add coords
-        for i in range(len(self.size)):
-            unit_cube[:, :, i] *= self.size[i]
-
-        # Resize the coords based on the size factor
-        resized_coords = (coords[0] * self.size[0], coords[1] * self.size[1], coords[2] * self.size[2])
-
-        # Add the coords
-        cubie = unit_cube + np.array(resized_coords)
+        # Resize the cube and coords based on the size factor, then add the coords
+        resized_coords = np.asarray(coords) * self._size_arr
+        cubie = _UNIT_CUBE * self._size_arr + resized_coords[..., None, None, :]
         return cubie
 
-    def __create_cuboid__(self, coords, colors):
-        """
-        Create a cuboid with the given coordinates and colors
-
-        :param coords: coordinates of the cuboid (tuple)
-        :param colors: colors of the cuboid (string)
-        :return: Tuple of vertices and colors
-        """
-
-        assert coords is not None
-        assert type(coords) is tuple and len(coords) == 3
-
-        assert colors is not None
-        assert isinstance(colors, (tuple, list)) and len(colors) == 3
-
-        # Create the cubified position data
-        vertices = self.__cubify__(coords)
-
-        # Rearrange coordinates to match drawing system
-        colors_re = (colors[2], colors[1], colors[0])
-
-        # We only want to color the three outside pieces of a cuboid
-        full_colors = [colors_re[0], colors_re[1], colors_re[2], 'black', 'black', 'black']
-
-        if coords[0] < 0:
-            full_colors[2], full_colors[3] = full_colors[3], full_colors[2]
-        if coords[1] > 0:
-            full_colors[1], full_colors[4] = full_colors[4], full_colors[1]
-        if coords[2] > 0:
-            full_colors[0], full_colors[5] = full_colors[5], full_colors[0]
-
-        return vertices, full_colors
-
-    def __create_voxel__(self, cuboids):
+    def __create_voxel__(self, vertices):
         """
-        Create voxels out of a list of cuboids
+        Create voxels out of the face vertices of the cuboids
 
-        :param cuboids: The cuboids to be drawn
-        :return: Poly3DCollection to represent a voxel
+        :param vertices: The (N, 4, 3) face vertices to be drawn
+        :return: Poly3DCollection to represent the voxels
         """
 
-        assert cuboids is not None
+        assert vertices is not None
 
-        return Poly3DCollection(np.array(cuboids[0]), facecolors=np.array(cuboids[1]), edgecolors='k')
+        return Poly3DCollection(vertices, edgecolors='k')
 
@@ -0,0 +1,332 @@
+"""
+
+=========================================================================================
+                        OpenGL drawing class for the cube
+=========================================================================================
+
+Draws the cube with a single instanced ModernGL draw call. The 26 cuboids share one unit
+cube vertex buffer, get their offsets from a per-instance buffer, and read their face colors
+from a small (6 x 26) texture, which is the only data uploaded per frame.
+
+main.py uses this Drawing when moderngl and glfw are installed. The matplotlib Drawing in
+draw.py is its fallback, and is kept for debugging.
+
+Dependencies:
+- Python 3.7
+- moderngl
+- glfw
+- numpy
+
+"""
+
+# Import external necessary modules
+import numpy as np
+import moderngl
+import glfw
+
+# Import internal necessary modules
+from rubiks.cube import Cube
+from rubiks.draw import _UNIT_CUBE, PALETTE, slot_tables, slot_colors
+
+# Corners of each face quad as two triangles, and the face coordinates of the quad corners
+_QUAD_TRIANGLES = (0, 1, 2, 0, 2, 3)
+_QUAD_UV = ((0, 0), (1, 0), (1, 1), (0, 1))
+
+# Camera angles, matching the default matplotlib 3D view
+_ELEVATION = np.radians(30)
+_AZIMUTH = np.radians(-60)
+
+_VERTEX_SHADER = """
+#version 330
+
+uniform mat4 mvp;
+uniform vec3 size;
+
+in vec3 in_vert;
+in vec2 in_uv;
+in int in_face;
+in vec3 in_offset;
+
+out vec2 v_uv;
+flat out ivec2 v_texel;
+
+void main() {
+    gl_Position = mvp * vec4(in_vert * size + in_offset, 1.0);
+    v_uv = in_uv;
+    v_texel = ivec2(in_face, gl_InstanceID);
+}
+"""
+
+_FRAGMENT_SHADER = """
+#version 330
+
+uniform sampler2D colors;
+uniform float border;
+
+in vec2 v_uv;
+flat in ivec2 v_texel;
+
+out vec4 f_color;
+
+void main() {
+    // Black edges around every face
+    vec2 edge = min(v_uv, 1.0 - v_uv);
+    if (min(edge.x, edge.y) < border) {
+        f_color = vec4(0.0, 0.0, 0.0, 1.0);
+    } else {
+        f_color = texelFetch(colors, v_texel, 0);
+    }
+}
+"""
+
+
+def _perspective(fovy, aspect, near, far):
+    """
+    Create a perspective projection matrix
+
+    :param fovy: Vertical field of view (radians)
+    :param aspect: Aspect ratio of the viewport
+    :param near: Distance to the near plane
+    :param far: Distance to the far plane
+    :return: The 4x4 projection matrix
+    """
+
+    f = 1 / np.tan(fovy / 2)
+
+    return np.array([[f / aspect, 0, 0, 0],
+                     [0, f, 0, 0],
+                     [0, 0, (far + near) / (near - far), 2 * far * near / (near - far)],
+                     [0, 0, -1, 0]])
+
+
+def _look_at(eye, target, up):
+    """
+    Create a view matrix looking from eye to target
+
+    :param eye: Position of the camera
+    :param target: Point the camera looks at
+    :param up: Up direction of the camera
+    :return: The 4x4 view matrix
+    """
+
+    forward = target - eye
+    forward = forward / np.linalg.norm(forward)
+    side = np.cross(forward, up)
+    side = side / np.linalg.norm(side)
+    up = np.cross(side, forward)
+
+    view = np.identity(4)
+    view[0, :3], view[1, :3], view[2, :3] = side, up, -forward
+    view[:3, 3] = -view[:3, :3] @ eye
+
+    return view
+
+
+class Drawing:
+    """
+    Class for handling drawing of the cube with OpenGL.
+    """
+
+    def __init__(self, _cube, _sizes=(1, 1, 1), _window_size=(640, 480)):
+        """
+        :param _cube: The cube to draw
+        :param _sizes: Tuple of sizes in the X, Y, Z directions
+        :param _window_size: Tuple of the width and height of the window
+        """
+
+        assert _cube is not None
+        assert type(_cube) is Cube
+
+        assert type(_sizes) == tuple
+        assert len(_sizes) == 3
+
+        self.cube = _cube
+        self.size = _sizes
+        self.window_size = _window_size
+
+        self.window = None
+        self.ctx = None
+        self.CONTEXT_OPEN = False
+
+        # Lookup tables and GL objects, built in init_context
+        self._slot_lut = None
+        self._face_slot = None
+        self._prog = None
+        self._vao = None
+        self._colors = None
+
+        # Face colors currently on screen
+        self._drawn = None
+
+    def init_context(self):
+        """
+        Create an initialize the window
+
+        :return: None
+        """
+
+        self.__create_context__()
+        self.__create_scene__()
+
+        self.draw()
+        self.__render__()
+        self.CONTEXT_OPEN = True
+
+    def draw(self):
+        """
+        Uploads the face colors if the cube changed
+
+        :return: Bool for if the colors changed since the last draw
+        """
+
+        face_colors = slot_colors(self.cube, self._slot_lut, self._face_slot)
+
+        if self._drawn is not None and np.array_equal(face_colors, self._drawn):
+            return False
+        self._drawn = face_colors
+
+        self._colors.write((PALETTE[face_colors] * 255).astype(np.uint8).tobytes())
+        return True
+
+    def update(self, _pause=0):
+        """
+        Redraw the window with new data if it is still open
+
+        Nothing is redrawn unless the cube changed
+
+        :param _pause: Seconds to keep handling window events after a redraw
+        :return: None
+        """
+
+        if glfw.window_should_close(self.window):
+            self.CONTEXT_OPEN = False
+            return
+
+        if self.draw():
+            self.__render__()
+
+            # Waiting returns on any event, so keep waiting until the whole pause has passed
+            end = glfw.get_time() + _pause
+            while not glfw.window_should_close(self.window):
+                remaining = end - glfw.get_time()
+                if remaining <= 0:
+                    break
+                glfw.wait_events_timeout(remaining)
+
+        glfw.poll_events()
+
+    def keep_open(self):
+        """
+        Keeps the window open after completion
+
+        :return: None
+        """
+
+        while self.CONTEXT_OPEN and not glfw.window_should_close(self.window):
+            self.draw()
+            self.__render__()
+            glfw.wait_events()
+
+        self.CONTEXT_OPEN = False
+        glfw.terminate()
+
+    def context_opened(self):
+        return self.CONTEXT_OPEN
+
+    def __create_context__(self):
+        """
+        Create the window and its OpenGL context
+
+        :return: None
+        """
+
+        if not glfw.init():
+            raise RuntimeError("Could not initialize GLFW")
+
+        glfw.window_hint(glfw.CONTEXT_VERSION_MAJOR, 3)
+        glfw.window_hint(glfw.CONTEXT_VERSION_MINOR, 3)
+        glfw.window_hint(glfw.OPENGL_PROFILE, glfw.OPENGL_CORE_PROFILE)
+        glfw.window_hint(glfw.OPENGL_FORWARD_COMPAT, True)
+
+        self.window = glfw.create_window(*self.window_size, "Rubik's Cube", None, None)
+        if not self.window:
+            glfw.terminate()
+            raise RuntimeError("Could not create the window")
+
+        glfw.make_context_current(self.window)
+        self.ctx = moderngl.create_context()
+
+    def __create_scene__(self):
+        """
+        Bake the geometry of the cuboids into GPU buffers
+
+        :return: None
+        """
+
+        assert self.ctx is not None
+
+        self._slot_lut, self._face_slot = slot_tables(self.cube.positions)
+
+        # Unit cube as 36 vertices of (x, y, z, u, v, face)
+        vertices = np.array([(*_UNIT_CUBE[face, k], *_QUAD_UV[k], face)
+                             for face in range(6) for k in _QUAD_TRIANGLES], dtype=np.float32)
+        vertex_data = np.zeros(len(vertices), dtype=[('vert', 'f4', 3), ('uv', 'f4', 2), ('face', 'i4')])
+        vertex_data['vert'], vertex_data['uv'] = vertices[:, :3], vertices[:, 3:5]
+        vertex_data['face'] = vertices[:, 5]
+
+        # The cuboids are in the same slot order as the color texture rows
+        offsets = (self.cube.positions * np.array(self.size)).astype(np.float32)
+
+        self._prog = self.ctx.program(vertex_shader=_VERTEX_SHADER, fragment_shader=_FRAGMENT_SHADER)
+        self._prog['size'].value = tuple(float(s) for s in self.size)
+        self._prog['border'].value = 0.04
+
+        self._vao = self.ctx.vertex_array(self._prog, [
+            (self.ctx.buffer(vertex_data.tobytes()), '3f 2f 1i', 'in_vert', 'in_uv', 'in_face'),
+            (self.ctx.buffer(offsets.tobytes()), '3f/i', 'in_offset')
+        ])
+
+        self._colors = self.ctx.texture((6, len(offsets)), 4)
+        self._colors.filter = (moderngl.NEAREST, moderngl.NEAREST)
+
+    def __mvp__(self, aspect):
+        """
+        Find the model-view-projection matrix of the camera
+
+        :param aspect: Aspect ratio of the viewport
+        :return: The 4x4 matrix, as float32 bytes in column major order
+        """
+
+        # Look at the center of the cube from the default matplotlib view angles
+        target = 0.5 * np.array(self.size)
+        eye = target + 12 * max(self.size) * np.array((np.cos(_ELEVATION) * np.cos(_AZIMUTH),
+                                                      np.cos(_ELEVATION) * np.sin(_AZIMUTH),
+                                                      np.sin(_ELEVATION)))
+
+        mvp = _perspective(np.radians(45), aspect, 0.1, 100) @ _look_at(eye, target, np.array((0, 0, 1)))
+        return mvp.T.astype(np.float32).tobytes()
+
+    def __render__(self, framebuffer=None):
+        """
+        Render the cube
+
+        :param framebuffer: The framebuffer to render to (defaults to the window)
+        :return: None
+        """
+
+        if framebuffer is None:
+            width, height = glfw.get_framebuffer_size(self.window)
+            self.ctx.viewport = (0, 0, width, height)
+        else:
+            width, height = framebuffer.size
+            framebuffer.use()
+
+        self.ctx.enable(moderngl.DEPTH_TEST)
+        self.ctx.clear(1.0, 1.0, 1.0)
+
+        self._colors.use(0)
+        self._prog['mvp'].write(self.__mvp__(width / max(height, 1)))
+        self._vao.render(moderngl.TRIANGLES, instances=len(self._face_slot))
+
+        if framebuffer is None:
+            glfw.swap_buffers(self.window)
@@ -0,0 +1,125 @@
+"""
+============================================================
+                    Packed Pieces
+============================================================
+
+Defines a packed encoding of the pieces, one uint64 per piece.
+
+Bit layout of a piece:
+- bits 0..5   : X, Y, Z coordinates as 2 bit signed fields (00 = 0, 01 = 1, 11 = -1)
+- bits 8..16  : X, Y, Z colors as 3 bit RubiksColors fields
+- bits 20..22 : The piece type (see PieceTypes)
+
+A rotation is then a handful of branchless shifts and masks over the whole
+(26,) array, which move the coordinate and color fields at the same time.
+
+"""
+
+# Import necessary modules
+import numpy as np
+
+from rubiks.cube import AXES, AXIS_INDEX, TYPE_BY_NONZERO
+from rubiks.piece import ROT_TABLE
+
+# Bit offsets of the fields
+COORD_SHIFT = (0, 2, 4)
+COLOR_SHIFT = (8, 11, 14)
+TYPE_SHIFT = 20
+
+COORD_MASK = np.uint64(0b11)
+COLOR_MASK = np.uint64(0b111)
+TYPE_MASK = np.uint64(0b111) << np.uint64(TYPE_SHIFT)
+
+
+def pack(positions, colors):
+    """
+    Pack the positions and colors of the pieces
+
+    :param positions: The (N, 3) int8 piece positions
+    :param colors: The (N, 3) uint8 piece colors
+    :return: The (N,) uint64 packed pieces
+    """
+
+    coords = positions.astype(np.int64) & 0b11
+    types = TYPE_BY_NONZERO[np.count_nonzero(positions, axis=1)].astype(np.int64)
+
+    codes = types << TYPE_SHIFT
+    for k in range(3):
+        codes |= coords[:, k] << COORD_SHIFT[k]
+        codes |= colors[:, k].astype(np.int64) << COLOR_SHIFT[k]
+
+    return codes.astype(np.uint64)
+
+
+def unpack(codes):
+    """
+    Unpack the positions and colors of the pieces
+
+    :param codes: The (N,) uint64 packed pieces
+    :return: Tuple of the (N, 3) int8 positions and (N, 3) uint8 colors
+    """
+
+    positions = np.empty((len(codes), 3), dtype=np.int8)
+    colors = np.empty((len(codes), 3), dtype=np.uint8)
+
+    for k in range(3):
+        field = ((codes >> np.uint64(COORD_SHIFT[k])) & COORD_MASK).astype(np.int8)
+
+        # Sign extend the 2 bit field (11 is -1)
+        positions[:, k] = field - ((field & 2) << 1)
+        colors[:, k] = (codes >> np.uint64(COLOR_SHIFT[k])) & COLOR_MASK
+
+    return positions, colors
+
+
+def piece_types(codes):
+    """
+    :param codes: The (N,) uint64 packed pieces
+    :return: The (N,) piece types
+    """
+
+    return ((codes & TYPE_MASK) >> np.uint64(TYPE_SHIFT)).astype(np.int8)
+
+
+def face_mask(codes, axis_id):
+    """
+    Find the pieces on a face given the name of the axis (see AXES)
+
+    :param codes: The (N,) uint64 packed pieces
+    :param axis_id: The name of the axis of the face
+    :return: A boolean mask of the pieces on the face
+    """
+
+    k = AXIS_INDEX[axis_id]
+    field = AXES[axis_id][k] & 0b11
+
+    return ((codes >> np.uint64(COORD_SHIFT[k])) & COORD_MASK) == field
+
+
+def rotate(codes, rot_id, mask):
+    """
+    Rotate the masked pieces in place given a rotation id
+
+    :param codes: The (N,) uint64 packed pieces
+    :param rot_id: The id of the rotation to apply (see ROT_TABLE)
+    :param mask: Boolean mask of the pieces to rotate
+    :return: None
+    """
+
+    perm, signs, (i, j) = ROT_TABLE[rot_id]
+
+    old = codes[mask]
+    new = old & TYPE_MASK
+
+    for k in range(3):
+        # Move coordinate perm[k] to k, negating by flipping the high bit of nonzero fields
+        field = (old >> np.uint64(COORD_SHIFT[perm[k]])) & COORD_MASK
+        if signs[k] < 0:
+            field ^= (field & np.uint64(1)) << np.uint64(1)
+        new |= field << np.uint64(COORD_SHIFT[k])
+
+        # Move the color on axis k, swapping axes i and j
+        src = j if k == i else i if k == j else k
+        new |= ((old >> np.uint64(COLOR_SHIFT[src])) & COLOR_MASK) << np.uint64(COLOR_SHIFT[k])
+
+    codes[mask] = new
@@ -8,21 +8,123 @@ Defines the Piece class and additional data for Pieces (colors and piece types)
 """
 
 # Import necessary modules
+from enum import IntEnum
+
+from maths.matrices import ROTATIONS
 from maths.points import Point3D
-from maths.matrices import Matrix3D, IDENTITY_MATRIX, ROT_X_CC
+from maths.quaternion import QUATERNIONS, rotate_vec
 
 
 # Colors on a Rubik's Cube
-class RubiksColors:
-    RED = 'red'
-    BLUE = 'blue'
-    GREEN = 'green'
-    YELLOW = 'yellow'
-    WHITE = 'white'
-    ORANGE = 'orange'
-    BLANK = 'black'
+# The values are small ints, so they can be stored directly in the cube's color arrays
+class RubiksColors(IntEnum):
+    RED = 0
+    BLUE = 1
+    GREEN = 2
+    YELLOW = 3
+    WHITE = 4
+    ORANGE = 5
+    BLANK = 6
+
+
+# Set after the class, since Enum reserves _sunder_ names in the class body
+RubiksColors._VALS_ = frozenset(RubiksColors)
+
+# Display (and matplotlib) name of each color, indexed by value
+COLOR_NAMES = ('red', 'blue', 'green', 'yellow', 'white', 'orange', 'black')
+
+
+def _signed_perm(q):
+    """
+    Break a 90 degree rotation quaternion into a signed axis permutation
+
+    The rotated point is just the coordinates reordered by perm and multiplied by signs,
+    which is found by rotating the unit vectors once
+
+    :param q: The rotation quaternion
+    :return: Tuple of the perm, the signs, and the two color axes to swap
+    """
+
+    # Where each unit vector goes
+    images = [rotate_vec(q, tuple(int(k == n) for k in range(3))) for n in range(3)]
+
+    perm = tuple(next(n for n in range(3) if images[n][k]) for k in range(3))
+    signs = tuple(images[perm[k]][k] for k in range(3))
+
+    # The colors on the two axes other than the axis of rotation are swapped
+    swap = tuple(k for k in range(3) if k != q.axis())
+
+    return perm, signs, swap
+
+
+def _check_rotations():
+    """
+    Check QUATERNIONS and the cube's rotation matrices (ROTATIONS) agree on every rotation id
 
-    _VALS_ = [RED, BLUE, GREEN, YELLOW, WHITE, ORANGE, BLANK]
+    The two are only tied by the order they are declared in, so each quaternion must send
+    every unit vector where the matrix with the same id does
+
+    :return: None
+    """
+
+    if len(QUATERNIONS) != len(ROTATIONS):
+        raise ValueError(f"Expected a rotation matrix for each of the {len(QUATERNIONS)} "\
+                         "rotation quaternions")
+
+    for rot_id, (q, R) in enumerate(zip(QUATERNIONS, ROTATIONS)):
+        for e in ((1, 0, 0), (0, 1, 0), (0, 0, 1)):
+            if rotate_vec(q, e) != tuple((R @ e).tolist()):
+                raise ValueError(f"Rotation quaternion and matrix {rot_id} do not match")
+
+
+_check_rotations()
+
+# Permutation, signs and color swap of every rotation, keyed by rotation id (see QUATERNIONS)
+ROT_TABLE = {rot_id: _signed_perm(q) for rot_id, q in enumerate(QUATERNIONS)}
+
+# New order of the colors of a piece after every rotation, keyed by rotation id
+_COLOR_PERM = {rot_id: tuple(j if k == i else i if k == j else k for k in range(3))
+               for rot_id, (_, _, (i, j)) in ROT_TABLE.items()}
+
+# Template of the rotate function specialized to a single rotation
+# The position is updated in place, which is safe since every piece owns its point
+_ROT_TEMPLATE = """
+def _rot_{rot_id}(piece):
+    pos = piece.pos
+    x, y, z = pos.x, pos.y, pos.z
+    pos.x, pos.y, pos.z = {new_x}, {new_y}, {new_z}
+
+    c = piece.colors
+    piece.colors = (c[{c_0}], c[{c_1}], c[{c_2}])
+"""
+
+
+def _build_rotate(rot_id):
+    """
+    Generate the rotate function of a single rotation
+
+    The permutation, signs and color order are inlined as constants, so the
+    function is just the assignments with no lookups, loops or branches
+
+    :param rot_id: The id of the rotation (see ROT_TABLE)
+    :return: Function that rotates a piece in place
+    """
+
+    perm, signs, _ = ROT_TABLE[rot_id]
+    new = ['-'*(s < 0) + 'xyz'[p] for p, s in zip(perm, signs)]
+
+    source = _ROT_TEMPLATE.format(rot_id=rot_id, new_x=new[0], new_y=new[1], new_z=new[2],
+                                  c_0=_COLOR_PERM[rot_id][0], c_1=_COLOR_PERM[rot_id][1],
+                                  c_2=_COLOR_PERM[rot_id][2])
+
+    namespace = {}
+    exec(source, namespace)
+
+    return namespace['_rot_{}'.format(rot_id)]
+
+
+# Specialized rotate function of every rotation, keyed by rotation id
+_ROT_FNS = {rot_id: _build_rotate(rot_id) for rot_id in ROT_TABLE}
 
 
 # Rubik's Piece Types
@@ -31,7 +133,11 @@ class PieceTypes:
     CORNER = 1
     CENTER = 2
 
-    _VALS_ = [EDGE, CORNER, CENTER]
+    _VALS_ = frozenset((EDGE, CORNER, CENTER))
+
+
+# Piece type by the number of nonzero coordinates (only the core would have none)
+_TYPE_BY_NONZERO = (None, PieceTypes.CENTER, PieceTypes.EDGE, PieceTypes.CORNER)
 
 
 class Piece:
@@ -41,58 +147,107 @@ class Piece:
     Position is a 3D point relative to the center of the cube.
     Coordinates can be -1, 0, or 1 [EX: (-1, -1, 0)]
 
-    Colors are a list of RubiksColors enum in a tuple.
+    Colors are a tuple of RubiksColors enum values.
     The first element corresponds to the X axis, the second the Y axis,
     and the third the Z axis.
     """
 
+    __slots__ = ('pos', 'colors', 'type')
+
     def __init__(self, _pos, _colors):
         """
         :param _pos: The 3D position of the
         :param _colors: The colors on the piece
         """
 
+        # Copy the point, since rotations update the position in place
         if isinstance(_pos, Point3D):
-            self.pos = _pos
+            self.pos = Point3D._fast(*_pos.get_coords())
         elif isinstance(_pos, (tuple, list)):
             self.pos = Point3D(_pos)
         else:
             raise ValueError(f"Piece only accepts the following types for _pos: "\
                              "Point3D, tuple, list")
 
-        if isinstance(_colors, list):
+        if isinstance(_colors, (tuple, list)):
             if any(elem not in RubiksColors._VALS_ for elem in _colors):
                 raise ValueError(f"Please use RubiksColors enum values for colors")
 
             assert len(_colors) == 3
 
-            self.colors = _colors
+            self.colors = tuple(_colors)
         else:
-            raise ValueError(f"Piece class only accepts lists for _color")
+            raise ValueError(f"Piece class only accepts the following types for _colors: "\
+                             "tuple, list")
 
         self.type = self.__set_type__()
 
+    @classmethod
+    def _unchecked(cls, pos, colors, ptype):
+        """
+        Create a piece from trusted data, skipping the checks in __init__
+
+        :param pos: The position of the piece (Point3D)
+        :param colors: The colors on the piece (tuple of RubiksColors)
+        :param ptype: The type of the piece (PieceTypes)
+        :return: The new piece
+        """
+
+        piece = object.__new__(cls)
+        piece.pos = pos
+        piece.colors = colors
+        piece.type = ptype
+
+        return piece
+
     def __set_type__(self):
         """
         Determines the type of piece
 
+        The type only depends on how many coordinates of the position are nonzero
+
         :return: The determined piece type
         """
 
-        if self.colors.count(RubiksColors.BLANK) == 2:
-            return PieceTypes.CENTER
-        elif self.colors.count(RubiksColors.BLANK) == 1:
-            return PieceTypes.EDGE
-        else:
-            return PieceTypes.CORNER
+        pos = self.pos
+        return _TYPE_BY_NONZERO[(pos.x != 0) + (pos.y != 0) + (pos.z != 0)]
 
     def __str__(self):
-        return "Pos: " + str(self.pos) + ", Colors: {}".format(self.colors) + \
+        colors = [COLOR_NAMES[c] for c in self.colors]
+        return "Pos: " + str(self.pos) + ", Colors: {}".format(colors) + \
                ", Type: {}".format(self.type)
 
     def __repr__(self):
         return "Piece" + str(self)
 
+    def __eq__(self, other):
+        """
+        Equal to operator
+
+        :param other: Compare object
+        :return: Bool for if the objects are equal
+        """
+
+        if not isinstance(other, Piece):
+            return NotImplemented
+
+        return self.key() == other.key()
+
+    def __ne__(self, other):
+        return not self == other
+
+    # Not hashable, since rotating a piece changes what it compares equal to (use key instead)
+    __hash__ = None
+
+    def key(self):
+        """
+        Get an immutable snapshot of the piece, for use as a dict or set key
+
+        :return: Tuple of the position coordinates and the colors
+        """
+
+        return self.pos.get_coords(), self.colors
+
     def get_piece_type(self):
         """
         :return: The piece type
@@ -100,29 +255,21 @@ class Piece:
 
         return self.type
 
-    def rotate(self, matrix):
+    def rotate(self, rot_id):
         """
-        Rotate the piece vector given a rotation matrix
+        Rotate the piece in place given a rotation id
 
-        :param matrix: The matrix to rotate by
+        :param rot_id: The id of the rotation to apply (see ROT_TABLE)
         :return: None
         """
 
-        assert type(matrix) == Matrix3D
-        
-        before = self.pos
-        self.pos = matrix * self.pos
-
-        # Return if there was no rotation
-        if self.pos == before:
-            return
+        # Rotates the position and swaps the colors
+        # A piece that stays put is on the axis of rotation, so both of the swapped colors are blank
+        _ROT_FNS[rot_id](self)
 
-        # Get the vector representing the axis of rotation
-        # Since it is a 90 degree rotation, we can just use the main diagonal of
-        # The rotation matrix
-        axis = matrix.diag()
-        
-        # Swap colors 
-        i, j = (x for x, elem in enumerate(axis) if elem == 0)
-        self.colors[i], self.colors[j] = self.colors[j], self.colors[i]
 
+# Use the compiled Piece if it has been built (see piece_c.pyx)
+try:
+    from rubiks.piece_c import Piece
+except ImportError:
+    pass
@@ -0,0 +1,241 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+==========================================================================
+                            Compiled Piece Class
+==========================================================================
+
+Defines a compiled version of the Piece class (see piece.py).
+
+The position and colors are stored as C arrays and rotate indexes into
+C copies of ROT_TABLE, so a rotation never touches a Python object.
+piece.py uses this class in place of its own when it has been built with:
+
+    cythonize -i rubiks/piece_c.pyx
+
+"""
+
+# Import necessary modules
+cimport cython
+from libc.stdint cimport int8_t
+
+from maths.points import Point3D
+from rubiks.piece import RubiksColors, COLOR_NAMES, ROT_TABLE, _TYPE_BY_NONZERO
+
+# Every color, indexed by value
+_COLORS = tuple(RubiksColors)
+
+# C copies of the permutation, signs and color swap of every rotation (see ROT_TABLE)
+cdef enum:
+    N_ROTATIONS = 6
+
+cdef int8_t ROT_PERM[N_ROTATIONS][3]
+cdef int8_t ROT_SIGN[N_ROTATIONS][3]
+cdef int8_t ROT_SWAP[N_ROTATIONS][2]
+
+assert len(ROT_TABLE) == N_ROTATIONS
+
+for _rot_id, (_perm, _signs, _swap) in ROT_TABLE.items():
+    for _k in range(3):
+        ROT_PERM[_rot_id][_k] = _perm[_k]
+        ROT_SIGN[_rot_id][_k] = _signs[_k]
+    ROT_SWAP[_rot_id][0], ROT_SWAP[_rot_id][1] = _swap
+
+
+# Final, so rotate can be called without the GIL (no subclass can override it)
+@cython.final
+cdef class Piece:
+    """
+    Class for a piece (cubie) in a Rubik's cube
+
+    Same interface as piece.Piece. The coordinates live in a C array, and pos
+    is a Point3D view of them (see PiecePos), so changing a coordinate of pos
+    still moves the piece.
+    """
+
+    cdef int8_t _pos[3]
+    cdef int8_t _colors[3]
+
+    # The PiecePos view of the position, made on first access
+    cdef object _view
+
+    # An object, since a piece at the core has no type (None)
+    cdef public object type
+
+    def __init__(self, _pos, _colors):
+        """
+        :param _pos: The 3D position of the
+        :param _colors: The colors on the piece
+        """
+
+        if isinstance(_pos, Point3D):
+            coords = _pos.get_coords()
+        elif isinstance(_pos, (tuple, list)):
+            coords = Point3D(_pos).get_coords()
+        else:
+            raise ValueError(f"Piece only accepts the following types for _pos: "\
+                             "Point3D, tuple, list")
+
+        if isinstance(_colors, (tuple, list)):
+            if any(elem not in RubiksColors._VALS_ for elem in _colors):
+                raise ValueError(f"Please use RubiksColors enum values for colors")
+
+            assert len(_colors) == 3
+        else:
+            raise ValueError(f"Piece class only accepts the following types for _colors: "\
+                             "tuple, list")
+
+        self.pos = coords
+        self.colors = _colors
+        self.type = _TYPE_BY_NONZERO[(self._pos[0] != 0) + (self._pos[1] != 0) + (self._pos[2] != 0)]
+
+    @classmethod
+    def _unchecked(cls, pos, colors, ptype):
+        """
+        Create a piece from trusted data, skipping the checks in __init__
+
+        :param pos: The position of the piece (Point3D)
+        :param colors: The colors on the piece (tuple of RubiksColors)
+        :param ptype: The type of the piece (PieceTypes)
+        :return: The new piece
+        """
+
+        cdef Piece piece = cls.__new__(cls)
+        piece.pos = pos
+        piece.colors = colors
+        piece.type = ptype
+
+        return piece
+
+    @property
+    def pos(self):
+        if self._view is None:
+            self._view = PiecePos(self)
+        return self._view
+
+    @pos.setter
+    def pos(self, pos):
+        x, y, z = pos.get_coords() if isinstance(pos, Point3D) else pos
+        self._pos[0], self._pos[1], self._pos[2] = x, y, z
+
+    @property
+    def colors(self):
+        return _COLORS[self._colors[0]], _COLORS[self._colors[1]], _COLORS[self._colors[2]]
+
+    @colors.setter
+    def colors(self, colors):
+        self._colors[0], self._colors[1], self._colors[2] = colors
+
+    def __reduce__(self):
+        return Piece, (self.pos.get_coords(), self.colors)
+
+    def __str__(self):
+        colors = [COLOR_NAMES[c] for c in self.colors]
+        return "Pos: " + str(self.pos) + ", Colors: {}".format(colors) + \
+               ", Type: {}".format(self.type)
+
+    def __repr__(self):
+        return "Piece" + str(self)
+
+    def __eq__(self, other):
+        """
+        Equal to operator
+
+        :param other: Compare object
+        :return: Bool for if the objects are equal
+        """
+
+        if not isinstance(other, Piece):
+            return NotImplemented
+
+        return self.key() == other.key()
+
+    def __ne__(self, other):
+        return not self == other
+
+    # Not hashable, since rotating a piece changes what it compares equal to (use key instead)
+    __hash__ = None
+
+    def key(self):
+        """
+        Get an immutable snapshot of the piece, for use as a dict or set key
+
+        :return: Tuple of the position coordinates and the colors
+        """
+
+        return self.pos.get_coords(), self.colors
+
+    def get_piece_type(self):
+        """
+        :return: The piece type
+        """
+
+        return self.type
+
+    cpdef void rotate(self, int rot_id) except * nogil:
+        """
+        Rotate the piece in place given a rotation id
+
+        :param rot_id: The id of the rotation to apply (see ROT_TABLE)
+        :return: None
+        """
+
+        cdef int8_t old[3]
+        cdef int8_t i, j, tmp
+
+        if rot_id < 0 or rot_id >= N_ROTATIONS:
+            with gil:
+                raise KeyError(rot_id)
+
+        i, j = ROT_SWAP[rot_id][0], ROT_SWAP[rot_id][1]
+        old[0], old[1], old[2] = self._pos[0], self._pos[1], self._pos[2]
+
+        self._pos[0] = ROT_SIGN[rot_id][0]*old[ROT_PERM[rot_id][0]]
+        self._pos[1] = ROT_SIGN[rot_id][1]*old[ROT_PERM[rot_id][1]]
+        self._pos[2] = ROT_SIGN[rot_id][2]*old[ROT_PERM[rot_id][2]]
+
+        # Swap colors
+        # A piece that stays put is on the axis of rotation, so both of the swapped colors are blank
+        tmp = self._colors[i]
+        self._colors[i] = self._colors[j]
+        self._colors[j] = tmp
+
+
+class PiecePos(Point3D):
+    """
+    Point3D view of the coordinates of a compiled Piece
+
+    Reading or writing x, y or z goes straight to the C array of the piece
+    """
+
+    __slots__ = ('_piece',)
+
+    def __init__(self, piece):
+        """
+        :param piece: The piece whose coordinates are viewed
+        """
+
+        self._piece = piece
+
+    @property
+    def x(self):
+        return (<Piece>self._piece)._pos[0]
+
+    @x.setter
+    def x(self, x):
+        (<Piece>self._piece)._pos[0] = x
+
+    @property
+    def y(self):
+        return (<Piece>self._piece)._pos[1]
+
+    @y.setter
+    def y(self, y):
+        (<Piece>self._piece)._pos[1] = y
+
+    @property
+    def z(self):
+        return (<Piece>self._piece)._pos[2]
+
+    @z.setter
+    def z(self, z):
+        (<Piece>self._piece)._pos[2] = z